@@ -1,22 +1,17 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 import time
 import json
 import os
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 import tempfile
-import base64
 
 # Import CV Analyzer and Debugger
 from cv_analyzer import CVAnalyzer
 from utils.debugger import Debugger
 
-# Initialize debugger
-debugger = Debugger()
-
 # App configuration
 st.set_page_config(
     page_title="CV Analyzer",
@@ -36,13 +31,48 @@ def get_analyzer():
 
 analyzer = get_analyzer()
 
-# Function to download files
-def get_download_link(data, filename, text):
-    if isinstance(data, str):
-        data = data.encode()
-    b64 = base64.b64encode(data).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">{text}</a>'
-    return href
+# Initialize debugger
+@st.cache_resource
+def get_debugger():
+    return Debugger()
+
+debugger = get_debugger()
+
+# Hand uploaded bytes to the path-based analyzer via a temporary file
+@contextmanager
+def temporary_upload(data, ext):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{ext}") as tmp:
+        tmp.write(data)
+        tmp_path = tmp.name
+
+    try:
+        yield tmp_path
+    finally:
+        # Delete temporary file
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+# Analyze an uploaded file, cached on its content so reruns skip the pipeline
+@st.cache_data(max_entries=128)
+def analyze_upload(data, ext, job_description=None, metric="analysis_duration"):
+    start_time = time.time()
+    with temporary_upload(data, ext) as tmp_path:
+        results = analyzer.analyze_cv_file(tmp_path, job_description)
+
+    # Log performance metric, only reached on a real analysis, not a cache hit
+    debugger.log_performance_metric(metric, time.time() - start_time)
+    return results
+
+# Extract text from an uploaded file, cached on its content
+@st.cache_data(max_entries=128)
+def extract_upload_text(data, ext):
+    with temporary_upload(data, ext) as tmp_path:
+        return analyzer.extract_text(tmp_path)
+
+# Export analysis results, cached per results and format so reruns skip serialization
+@st.cache_data(max_entries=128)
+def cached_export(results, fmt):
+    return analyzer.export_results(results, format=fmt)
 
 # Page navigation
 page = st.sidebar.selectbox(
@@ -52,35 +82,25 @@ page = st.sidebar.selectbox(
 
 # CV Analysis page
 if page == "CV Analyse":
+    # Charting libraries are only needed on the analysis pages
+    import pandas as pd
+    import plotly.express as px
+
     st.header("Lebenslauf analysieren")
     
     # File upload
     uploaded_file = st.file_uploader("Wählen Sie einen Lebenslauf (PDF, DOCX)", type=["pdf", "docx"])
     
     if uploaded_file is not None:
-        # Save temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp:
-            tmp.write(uploaded_file.getvalue())
-            tmp_path = tmp.name
-        
         try:
             # Progress bar
             progress_bar = st.progress(0)
-            start_time = time.time()
             
             # Perform analysis
             with st.spinner("Analysiere Lebenslauf..."):
-                for i in range(100):
-                    # Simulate progress
-                    time.sleep(0.01)
-                    progress_bar.progress(i + 1)
-                
                 # Actual analysis
-                results = analyzer.analyze_cv_file(tmp_path)
-                
-                # Log performance metric
-                duration = time.time() - start_time
-                debugger.log_performance_metric("analysis_duration", duration)
+                results = analyze_upload(uploaded_file.getvalue(), uploaded_file.name.split('.')[-1])
+                progress_bar.progress(100)
             
             # Display results
             st.success("Analyse abgeschlossen!")
@@ -101,9 +121,10 @@ if page == "CV Analyse":
             # Visualize skills
             st.subheader("Fähigkeiten")
             if "skills" in results and results["skills"]:
+                skill_names, skill_ratings = zip(*results["skills"].items())
                 skills_df = pd.DataFrame({
-                    "Fähigkeit": list(results["skills"].keys()),
-                    "Bewertung": list(results["skills"].values())
+                    "Fähigkeit": skill_names,
+                    "Bewertung": skill_ratings
                 })
                 
                 fig = px.bar(
@@ -171,38 +192,43 @@ if page == "CV Analyse":
             # JSON Export
             with col1:
                 json_data = json.dumps(results, indent=2)
-                st.markdown(
-                    get_download_link(json_data, "cv_analysis.json", "Als JSON herunterladen"),
-                    unsafe_allow_html=True
+                st.download_button(
+                    "Als JSON herunterladen",
+                    data=json_data,
+                    file_name="cv_analysis.json",
+                    mime="application/json"
                 )
             
             # CSV Export
             with col2:
-                csv_data = analyzer.export_results(results, format="csv")
-                st.markdown(
-                    get_download_link(csv_data, "cv_analysis.csv", "Als CSV herunterladen"),
-                    unsafe_allow_html=True
+                csv_data = cached_export(results, "csv")
+                st.download_button(
+                    "Als CSV herunterladen",
+                    data=csv_data,
+                    file_name="cv_analysis.csv",
+                    mime="text/csv"
                 )
             
             # Excel Export
             with col3:
-                excel_data = analyzer.export_results(results, format="excel")
-                st.markdown(
-                    get_download_link(excel_data, "cv_analysis.xlsx", "Als Excel herunterladen"),
-                    unsafe_allow_html=True
+                excel_data = cached_export(results, "excel")
+                st.download_button(
+                    "Als Excel herunterladen",
+                    data=excel_data,
+                    file_name="cv_analysis.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                 )
                 
         except Exception as e:
             st.error(f"Fehler bei der Analyse: {str(e)}")
             debugger.log_error(e, "cv_analysis")
-        
-        finally:
-            # Delete temporary file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
 
 # Job Matching page
 elif page == "Job Matching":
+    # Charting libraries are only needed on the analysis pages
+    import pandas as pd
+    import plotly.express as px
+
     st.header("Lebenslauf mit Stellenbeschreibung abgleichen")
     
     col1, col2 = st.columns(2)
@@ -217,48 +243,33 @@ elif page == "Job Matching":
         job_file = st.file_uploader("Stellenbeschreibung hochladen (PDF, DOCX, TXT)", type=["pdf", "docx", "txt"])
         
         if job_file is not None:
-            # Save temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{job_file.name.split('.')[-1]}") as tmp:
-                tmp.write(job_file.getvalue())
-                job_path = tmp.name
-            
+            job_ext = job_file.name.split('.')[-1].lower()
+
             # Read file
             try:
-                job_description = analyzer.extract_text(job_path)
+                if job_ext == "txt":
+                    # Plain text needs no parser, decode the upload in memory
+                    job_description = job_file.getvalue().decode("utf-8", errors="replace")
+                else:
+                    job_description = extract_upload_text(job_file.getvalue(), job_ext)
                 st.success("Stellenbeschreibung erfolgreich geladen!")
             except Exception as e:
                 st.error(f"Fehler beim Lesen der Stellenbeschreibung: {str(e)}")
                 debugger.log_error(e, "job_description_reading")
-            
-            # Delete temporary file
-            if os.path.exists(job_path):
-                os.unlink(job_path)
     
     # Match button
     if cv_file and (job_description or job_file):
         if st.button("Lebenslauf mit Stellenbeschreibung abgleichen"):
-            # Save temporary file for CV
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{cv_file.name.split('.')[-1]}") as tmp:
-                tmp.write(cv_file.getvalue())
-                cv_path = tmp.name
-            
             try:
                 # Progress bar
                 progress_bar = st.progress(0)
-                start_time = time.time()
                 
                 with st.spinner("Führe Matching durch..."):
-                    for i in range(100):
-                        # Simulate progress
-                        time.sleep(0.01)
-                        progress_bar.progress(i + 1)
-                    
                     # Actual analysis
-                    results = analyzer.analyze_cv_file(cv_path, job_description)
-                    
-                    # Log performance metric
-                    duration = time.time() - start_time
-                    debugger.log_performance_metric("match_duration", duration)
+                    results = analyze_upload(
+                        cv_file.getvalue(), cv_file.name.split('.')[-1], job_description, metric="match_duration"
+                    )
+                    progress_bar.progress(100)
                 
                 st.success("Matching abgeschlossen!")
                 
@@ -287,9 +298,10 @@ elif page == "Job Matching":
                 st.subheader("Empfohlene Verbesserungen")
                 
                 if "missing_skills" in results and results["missing_skills"]:
+                    missing_names, missing_weights = zip(*results["missing_skills"].items())
                     missing_skills_df = pd.DataFrame({
-                        "Fähigkeit": list(results["missing_skills"].keys()),
-                        "Wichtigkeit": list(results["missing_skills"].values())
+                        "Fähigkeit": missing_names,
+                        "Wichtigkeit": missing_weights
                     })
                     
                     fig = px.bar(
@@ -1,66 +1,225 @@
 import os
+import sys
+import atexit
+import collections
+import itertools
 import logging
-import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 
+import orjson
+
+# Queue marker that tells the writer thread to exit
+_STOP = object()
+
+# Interned exception class names, filled on first use
+_type_names = {}
+
+def _write_all(fd, data):
+    """Write all of data to a raw file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def _csv_field(text):
+    """Encode text as a CSV field, quoting it if it contains a separator, quote or newline."""
+    if any(c in text for c in ',"\r\n'):
+        text = '"' + text.replace('"', '""') + '"'
+    return text.encode()
+
+# __slots__ is declared by hand because dataclass(slots=True) needs Python 3.10
+@dataclass
+class ErrorRecord:
+    """A logged error, as stored in memory and written to errors.json."""
+    __slots__ = ("timestamp_ns", "type", "message", "context")
+    timestamp_ns: int
+    type: str
+    message: str
+    context: str
+
+@dataclass
+class MetricRecord:
+    """A logged performance metric, as stored in memory and written to performance.csv."""
+    __slots__ = ("timestamp_ns", "metric", "value")
+    timestamp_ns: int
+    metric: str
+    value: object
+
 class Debugger:
     """A utility class for debugging and logging in the CV Analyzer application."""
     
-    def __init__(self, log_dir="logs"):
-        """Initialize the debugger with a log directory."""
+    def __init__(self, log_dir="logs", sample_rate=1, enabled=True, max_in_memory=10_000):
+        """Initialize the debugger with a log directory.
+        
+        Performance metrics are skipped entirely when ``enabled`` is False,
+        otherwise only every ``sample_rate``-th metric is recorded. Only the
+        last ``max_in_memory`` errors and metrics are kept in memory; the
+        log files keep everything.
+        """
         self.log_dir = log_dir
-        self.errors = []
-        self.performance_metrics = []
+        self._enabled = enabled
+        self._sample_n = sample_rate
+        # next() on itertools.count is atomic, so concurrent sessions never lose a tick
+        self._metric_counter = itertools.count(1)
+        self._err_path = os.path.join(log_dir, "errors.json")
+        self._perf_path = os.path.join(log_dir, "performance.csv")
+        # Recent events are kept as records in bounded deques
+        self.errors = collections.deque(maxlen=max_in_memory)
+        self.performance_metrics = collections.deque(maxlen=max_in_memory)
+        self._err_summary_cache = None
+        self._err_lock = threading.Lock()
         
         # Create log directory if it doesn't exist
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+        os.makedirs(log_dir, exist_ok=True)
         
-        # Set up logging
-        logging.basicConfig(
-            filename=os.path.join(log_dir, f"cv_analyzer_{datetime.now().strftime('%Y%m%d')}.log"),
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        # Set up a dedicated logger so the root logger is left untouched
         self.logger = logging.getLogger('cv_analyzer')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        if not self.logger.handlers:
+            handler = logging.FileHandler(
+                os.path.join(log_dir, f"cv_analyzer_{datetime.now().strftime('%Y%m%d')}.log"),
+                delay=True
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+            self.logger.addHandler(handler)
+        
+        # Errors go to a JSON-lines file and metrics to a CSV file, appended to via raw descriptors
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        self._err_fd = os.open(self._err_path, flags, 0o644)
+        self._perf_fd = os.open(self._perf_path, flags, 0o644)
+        if os.fstat(self._perf_fd).st_size == 0:
+            _write_all(self._perf_fd, b"timestamp_ns,metric,value\n")
+        
+        # Records are written by a background thread so callers never block on disk I/O
+        self._queue = queue.SimpleQueue()
+        self._write_failed = False
+        self._closed = False
+        self._state_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._drain, name="cv_analyzer-debugger", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
     
     def log_error(self, error, context=None):
-        """Log an error with optional context."""
-        error_info = {
-            "timestamp": datetime.now().isoformat(),
-            "type": type(error).__name__,
-            "message": str(error),
-            "context": context or "general"
-        }
+        """Log an error with optional context. Does nothing after close()."""
+        if self._closed:
+            return
+        
+        error_class = type(error)
+        error_type = _type_names.get(error_class)
+        if error_type is None:
+            error_type = _type_names[error_class] = sys.intern(error_class.__name__)
+        
+        # Single string argument with the default __str__ is the message itself
+        args = getattr(error, "args", ())
+        if len(args) == 1 and type(args[0]) is str and error_class.__str__ is BaseException.__str__:
+            message = args[0]
+        else:
+            message = str(error)
         
-        self.errors.append(error_info)
-        self.logger.error(f"Error in {context}: {str(error)}")
+        record = ErrorRecord(time.time_ns(), error_type, message, context or "general")
+        with self._err_lock:
+            self.errors.append(record)
+            self._err_summary_cache = None
+        self.logger.error("Error in %s: %s", context, message)
         
         # Also write to error log file
-        with open(os.path.join(self.log_dir, "errors.json"), "a") as f:
-            json.dump(error_info, f)
-            f.write("\n")
+        if not self._write_failed:
+            self._queue.put((self._err_fd, orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)))
     
     def log_performance_metric(self, metric, value):
-        """Log a performance metric."""
-        metric_info = {
-            "timestamp": datetime.now().isoformat(),
-            "metric": metric,
-            "value": value
-        }
+        """Log a performance metric. Does nothing after close()."""
+        if self._closed:
+            return
         
-        self.performance_metrics.append(metric_info)
-        self.logger.info(f"Performance metric: {metric} = {value}")
+        metric_count = next(self._metric_counter)
+        if not self._enabled or (self._sample_n > 1 and metric_count % self._sample_n):
+            return
         
-        # Also write to performance log file
-        with open(os.path.join(self.log_dir, "performance.json"), "a") as f:
-            json.dump(metric_info, f)
-            f.write("\n")
+        record = MetricRecord(time.time_ns(), metric, value)
+        self.performance_metrics.append(record)
+        
+        # Also write to performance log file as a compact CSV row
+        if not self._write_failed:
+            line = b"%d,%b,%b\n" % (record.timestamp_ns, _csv_field(str(metric)), _csv_field(str(value)))
+            self._queue.put((self._perf_fd, line))
+    
+    def _drain(self):
+        """Write queued records, one write per file for each batch."""
+        while True:
+            item = self._queue.get()
+            batches = {}
+            waiters = []
+            stop = False
+            
+            # Take everything already queued before writing
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    fd, payload = item
+                    batches.setdefault(fd, []).append(payload)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            try:
+                # O_APPEND keeps each write atomic at the end of the file
+                if not self._write_failed:
+                    for fd, payloads in batches.items():
+                        _write_all(fd, b"".join(payloads))
+            except Exception:
+                # Keep draining so flush() and close() still return, but stop accepting records
+                self._write_failed = True
+                self.logger.exception("Failed to write debugger records, file logging disabled")
+            finally:
+                for waiter in waiters:
+                    waiter.set()
+            if stop:
+                return
+    
+    def flush(self):
+        """Block until all records logged so far are written to the log files."""
+        done = threading.Event()
+        # Queue the marker under the lock so it can never land behind close()'s stop marker
+        with self._state_lock:
+            if self._closed:
+                return
+            self._queue.put(done)
+        done.wait()
+    
+    def close(self):
+        """Write pending records, stop the writer thread and close the log files."""
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+        os.close(self._err_fd)
+        os.close(self._perf_fd)
+        self._err_fd = self._perf_fd = None
+        atexit.unregister(self.close)
     
     def get_error_summary(self):
-        """Get a summary of logged errors."""
-        return [(e["timestamp"], e["type"], e["message"], e["context"]) for e in self.errors]
+        """Get a summary of recently logged errors, cached until the next error is logged."""
+        # The lock keeps a concurrent log_error from being overwritten by a stale rebuild
+        with self._err_lock:
+            if self._err_summary_cache is None:
+                self._err_summary_cache = tuple(
+                    (r.timestamp_ns, r.type, r.message, r.context) for r in self.errors
+                )
+            return self._err_summary_cache
     
     def get_performance_metrics(self):
-        """Get all logged performance metrics."""
-        return self.performance_metrics
+        """Get recently logged performance metrics."""
+        return [
+            {"timestamp_ns": r.timestamp_ns, "metric": r.metric, "value": r.value}
+            for r in tuple(self.performance_metrics)
+        ]